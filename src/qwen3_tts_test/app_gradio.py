@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 import os
+import queue
 import threading
+import time
 from pathlib import Path
 from typing import Any
 
@@ -10,7 +12,11 @@ import gradio as gr
 import torch
 
 from .voice_clone_core import (
+    QUANTIZATION_CHOICES,
     GradioLogHandler,
+    Quantization,
+    preflight_check,
+    preload_models,
     setup_logging,
     synthesize_voice_clone,
     validate_required_inputs,
@@ -28,6 +34,10 @@ MODEL_PRESETS = {
 }
 
 DEFAULT_MODEL = MODEL_QUALITY
+# 起動時の事前読み込みと量子化の初期値。int8 / int4 を使うなら全精度のモデルを常駐させずに済む
+DEFAULT_QUANTIZE: Quantization = next(
+    (q for q in QUANTIZATION_CHOICES if q == os.environ.get("QWEN3_TTS_QUANTIZE", "none")), "none"
+)
 
 # Use environment variable or current working directory as base
 _BASE_DIR = Path(os.environ.get("APP_BASE_DIR", Path.cwd())).resolve()
@@ -38,6 +48,14 @@ LOG_FILE = _BASE_DIR / "logs" / "app.log"
 LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 STEPS = ["入力チェック", "モデル読み込み", "音声生成", "ファイル保存"]
+# voice_clone_core からの段階通知 -> (STEPS の番号, ステータス表示)
+STAGE_STATUS = {
+    "load_model": (2, "モデル読み込み中..."),
+    "generate": (3, "音声生成中..."),
+    "save": (4, "ファイル保存中..."),
+}
+# Gradio への画面更新は最大でも 5 回/秒に抑える
+MIN_UPDATE_INTERVAL = 0.2
 
 
 def run_generation(
@@ -48,6 +66,7 @@ def run_generation(
     output_dir: str,
     model_id: str,
     use_float32: bool,
+    quantize: Quantization = "none",
 ) -> Any:
     logger = setup_logging(LOG_FILE)
     gradio_handler = GradioLogHandler()
@@ -59,11 +78,11 @@ def run_generation(
     current_step = 0
     status_text = "待機中"
 
-    def flush(audio_path: str | None = None, out_path: str = "", enable_button: bool = True) -> Any:
+    def flush(audio: Any = None, out_path: str = "", enable_button: bool = True) -> Any:
         step_display = f"[{current_step}/{len(STEPS)}] {STEPS[current_step - 1] if current_step > 0 else ''}".strip()
         return (
             gradio_handler.get_logs(),
-            audio_path,
+            audio,
             out_path,
             gr.update(interactive=enable_button),
             step_display,
@@ -74,7 +93,9 @@ def run_generation(
     logger.info("入力チェック開始")
     yield flush(enable_button=False)
 
-    if errors := validate_required_inputs(ref_audio_path, ref_text, input_text, output_dir):
+    if errors := preflight_check() + validate_required_inputs(
+        ref_audio_path, ref_text, input_text, output_dir
+    ):
         current_step, status_text = 0, "入力エラー"
         logger.warning("入力エラー: %s", errors)
         yield flush(enable_button=True)
@@ -103,19 +124,12 @@ def run_generation(
         logger.removeHandler(gradio_handler)
         return
 
-    current_step, status_text = 2, "モデル読み込み中..."
-    logger.info("モデル読み込み開始")
-    yield flush(enable_button=False)
-
-    result_holder: dict[str, dict[str, Any]] = {}
-    error_holder: dict[str, Exception] = {}
-    done = threading.Event()
-
+    events: queue.Queue[tuple[str, Any]] = queue.Queue()
     dtype = torch.float32 if use_float32 else torch.float16
 
     def worker() -> None:
         try:
-            result_holder["value"] = synthesize_voice_clone(
+            result = synthesize_voice_clone(
                 ref_audio_path=ref_audio_path or "",
                 ref_text=ref_text,
                 input_text=input_text,
@@ -123,36 +137,65 @@ def run_generation(
                 language=language,
                 model_id=model_id,
                 dtype=dtype,
+                quantize=quantize,
+                progress_callback=lambda stage: events.put(("stage", stage)),
+                chunk_callback=lambda wav, sr: events.put(("audio", (sr, wav))),
+                background_save=True,
             )
+            events.put(("result", result))
         except Exception as exc:
-            error_holder["value"] = exc
-        finally:
-            done.set()
+            events.put(("error", exc))
 
     threading.Thread(target=worker, daemon=True).start()
-    current_step, status_text = 3, "音声生成中..."
-    yield flush(enable_button=False)
-
-    done.wait()
 
-    if "value" in error_holder:
+    # 段階通知・音声チャンクが届いたときだけ画面を更新する。間隔が短すぎる段階通知はまとめて反映する
+    last_flush = 0.0
+    pending = False
+    while True:
+        timeout = None
+        if pending:
+            timeout = max(0.0, MIN_UPDATE_INTERVAL - (time.monotonic() - last_flush))
+        try:
+            kind, payload = events.get(timeout=timeout)
+        except queue.Empty:
+            kind, payload = "flush", None
+        audio = None
+        if kind == "stage":
+            current_step, status_text = STAGE_STATUS.get(payload, (current_step, status_text))
+            pending = True
+            if time.monotonic() - last_flush < MIN_UPDATE_INTERVAL:
+                continue
+        elif kind == "audio":
+            audio = payload
+        elif kind != "flush":
+            break
+        yield flush(audio=audio, enable_button=False)
+        last_flush, pending = time.monotonic(), False
+
+    if kind == "error":
         current_step, status_text = 0, "生成失敗"
-        logger.error("エラー: %s", error_holder["value"])
+        logger.error("エラー: %s", payload)
         yield flush(enable_button=True)
         logger.removeHandler(gradio_handler)
         return
 
-    result = result_holder["value"]
+    result = payload
     logger.info("%s", result["message"])
 
     if result["ok"]:
+        # 音声はチャンクとして再生済みなので、保存の完了を待たずに完了表示にする
         current_step, status_text = 4, "完了"
+        yield flush(enable_button=False)
+        try:
+            result["save_future"].result()
+        except Exception as exc:
+            current_step, status_text = 0, "ファイル保存失敗"
+            logger.error("音声ファイル保存失敗: %s", exc)
+            yield flush(enable_button=True)
+            logger.removeHandler(gradio_handler)
+            return
         logger.info("処理完了")
-        yield flush(
-            audio_path=str(result["output_path"]),
-            out_path=str(result["output_path"]),
-            enable_button=True,
-        )
+        yield flush(out_path=str(result["output_path"]), enable_button=True)
     else:
         current_step, status_text = 0, "生成失敗"
         logger.error("生成失敗")
@@ -213,6 +256,12 @@ def build_ui() -> gr.Blocks:
                         value=True,
                         info="float16はMPSでエラーが出ることがあります。メモリ節約したい場合のみfloat16を試してください。",
                     )
+                    quantize = gr.Dropdown(
+                        label="重みの量子化",
+                        choices=list(QUANTIZATION_CHOICES),
+                        value=DEFAULT_QUANTIZE,
+                        info="int8 / int4 はメモリ使用量を抑えます（optimum-quanto が必要、音質が下がる場合があります）。",
+                    )
                     gr.Markdown("モデルを自由入力する場合は `カスタム入力` を選択。")
 
                 run_button = gr.Button("音声を生成", variant="primary")
@@ -220,7 +269,13 @@ def build_ui() -> gr.Blocks:
                 status_box = gr.Textbox(label="処理ステータス", value="待機中", interactive=False)
                 log_box = gr.Textbox(label="実行ログ", lines=14, interactive=False)
 
-        output_audio = gr.Audio(label="生成音声", type="filepath", interactive=False)
+        output_audio = gr.Audio(
+            label="生成音声",
+            type="filepath",
+            interactive=False,
+            streaming=True,
+            autoplay=True,
+        )
         output_path = gr.Textbox(label="出力ファイル", interactive=False)
 
         run_button.click(
@@ -233,6 +288,7 @@ def build_ui() -> gr.Blocks:
                 output_dir,
                 model_id,
                 use_float32,
+                quantize,
             ],
             outputs=[
                 log_box,
@@ -251,7 +307,16 @@ def build_ui() -> gr.Blocks:
 
 
 def main() -> None:
-    setup_logging(LOG_FILE)
+    logger = setup_logging(LOG_FILE)
+    if os.environ.get("QWEN3_TTS_QUANTIZE", "none") != DEFAULT_QUANTIZE:
+        logger.warning("QWEN3_TTS_QUANTIZE の値が不正なため none を使います")
+    # UI の表示を待たせないよう、既定モデルはバックグラウンドで読み込む
+    threading.Thread(
+        target=preload_models,
+        args=([DEFAULT_MODEL], torch.float32),
+        kwargs={"quantize": DEFAULT_QUANTIZE},
+        daemon=True,
+    ).start()
     app = build_ui()
     app.queue(default_concurrency_limit=1)
     app.launch(server_name="127.0.0.1", server_port=7860, inbrowser=True)
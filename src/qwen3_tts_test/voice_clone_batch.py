@@ -1,5 +1,5 @@
 # 使用例:
-# python3 voice_clone_batch.py \
+# uv run batch \
 #   --ref-audio myvoice.mp3 \
 #   --ref-text-file myvoice_ref.txt \
 #   --text-file input.txt \
@@ -13,10 +13,16 @@ import logging
 import sys
 from pathlib import Path
 
-import numpy as np
 import soundfile as sf
 
-from .voice_clone_core import VoiceCloneError, generate_voice_waveform, setup_logging
+from .voice_clone_core import (
+    DEFAULT_BATCH_SIZE,
+    QUANTIZATION_CHOICES,
+    VoiceCloneError,
+    concat_with_silence,
+    generate_voice_waveforms_batch,
+    setup_logging,
+)
 
 
 def main() -> None:
@@ -37,6 +43,18 @@ def main() -> None:
     )
     ap.add_argument("--language", default="Japanese", help="Japanese / English / auto など")
     ap.add_argument("--silence", type=float, default=0.25, help="行間無音秒")
+    ap.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="1 回のモデル呼び出しでまとめて生成する行数",
+    )
+    ap.add_argument(
+        "--quantize",
+        choices=QUANTIZATION_CHOICES,
+        default="none",
+        help="重みの量子化（int8 / int4 は optimum-quanto が必要）",
+    )
     args = ap.parse_args()
 
     log_file = Path(__file__).resolve().parent.parent / "logs" / "batch.log"
@@ -80,35 +98,24 @@ def main() -> None:
             raise RuntimeError("ref_text_file が空です。")
         logger.info("参照テキスト: %d文字", len(ref_text))
 
-    wav_list: list[np.ndarray] = []
-    out_sr = 0
-
-    for i, line in enumerate(lines, 1):
-        logger.info("行 %d/%d 処理中: %.50s...", i, len(lines), line)
-        wav, sr = generate_voice_waveform(
-            ref_audio_path=str(ref_audio),
-            ref_text=ref_text,
-            input_text=line,
-            language=args.language,
-            model_id=args.model,
-            x_vector_only_mode=bool(args.x_vector_only),
-        )
-        wav_list.append(wav)
-        out_sr = sr
-
-    sil = np.zeros(int(out_sr * args.silence), dtype=np.float32)
-    out_wav: list[np.ndarray] = []
-    for i, w in enumerate(wav_list):
-        out_wav.append(w.astype(np.float32, copy=False))
-        if i != len(wav_list) - 1:
-            out_wav.append(sil)
-    merged = np.concatenate(out_wav, axis=0) if out_wav else np.zeros((0,), dtype=np.float32)
+    wav_list, out_sr = generate_voice_waveforms_batch(
+        ref_audio_path=str(ref_audio),
+        ref_text=ref_text,
+        input_texts=lines,
+        language=args.language,
+        model_id=args.model,
+        x_vector_only_mode=bool(args.x_vector_only),
+        quantize=args.quantize,
+        batch_size=args.batch_size,
+    )
+
+    merged = concat_with_silence(wav_list, out_sr, args.silence)
 
     sf.write(str(out_path), merged, out_sr)
     logger.info("保存完了: %s sr=%d lines=%d", out_path, out_sr, len(lines))
 
 
-if __name__ == "__main__":
+def run() -> None:
     try:
         main()
     except VoiceCloneError as err:
@@ -117,3 +124,7 @@ if __name__ == "__main__":
     except Exception:
         logging.getLogger("qwen_tts").exception("予期しないエラー")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
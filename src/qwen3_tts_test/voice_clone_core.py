@@ -1,18 +1,74 @@
 from __future__ import annotations
 
+import functools
+import gc
 import logging
-import tempfile
+import os
+import re
+import shutil
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from math import gcd
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import numpy as np
 import soundfile as sf
 import torch
 from pydub import AudioSegment
 from qwen_tts import Qwen3TTSModel
-
-_MODEL_CACHE: dict[str, Any] = {}
+from scipy.signal import resample_poly
+
+# 処理段階の通知先。"load_model" / "generate" / "save" のいずれかで呼ばれる
+ProgressCallback = Callable[[str], None]
+# 逐次生成した波形の通知先 (波形, サンプルレート)
+ChunkCallback = Callable[[np.ndarray, int], None]
+
+# 重みの量子化方式。"none" は読み込んだ dtype のまま使う
+Quantization = Literal["none", "int8", "int4"]
+QUANTIZATION_CHOICES: tuple[Quantization, ...] = ("none", "int8", "int4")
+
+# モデルに渡す参照音声 (16kHz モノラル float32 波形, サンプルレート)
+RefAudio = tuple[np.ndarray, int]
+# create_voice_clone_prompt が返す参照音声のプロンプト（VoiceClonePromptItem のリスト）
+VoiceClonePrompt = list[Any]
+REF_SAMPLE_RATE = 16000
+
+# 一括生成で 1 回のモデル呼び出しにまとめる行数
+DEFAULT_BATCH_SIZE = 4
+# 逐次再生で 1 回に返す音声の最小長（秒）
+STREAM_MIN_CHUNK_SEC = 2.0
+# 文ごとに生成した音声の間に入れる無音（秒）。一括生成 CLI の行間（--silence）と同じ既定値
+SENTENCE_SILENCE_SEC = 0.25
+# 文末記号の直後（続く閉じ括弧・記号は前の文に含める）、英文のピリオド+空白、改行で区切る。
+# 閉じ括弧の後は次の文が始まる（開き括弧・空白が続く）場合だけ区切り、「はい！」と言った。は 1 文のまま
+_SENTENCE_BOUNDARY = re.compile(
+    r"(?<=[。！？!?])(?![。！？!?」』）)])|(?<=[。！？!?][」』）)])(?=[「『（(\s])|(?<=\.)(?=\s)|(?<=\n)"
+)
+# これより短い断片（"Mr." や「はい。」など）は単独でモデルに渡さず次の文につなげる
+_MIN_SENTENCE_CHARS = 8
+
+_DEVICE = "mps"
+# MPS の有無はプロセス中に変わらないので、Metal への問い合わせは import 時の 1 回だけにする
+_HAS_MPS = bool(getattr(torch.backends, "mps", None) and torch.backends.mps.is_available())
+_FFMPEG_PATH = shutil.which("ffmpeg")
+# inductor は MPS 未対応のため MPS では aot_eager を使う
+_COMPILE_BACKENDS = {"mps": "aot_eager", "cuda": "inductor"}
+# 1 トークンごとに呼ばれるデコーダ本体（Qwen3TTSForConditionalGeneration からの属性パス）。
+# talker.forward は毎ステップ code_predictor.generate も回すので、両方の Transformer を対象にする
+_COMPILE_TARGETS = ("talker.model", "talker.code_predictor.model")
+# (モデル ID, dtype, 量子化) -> モデル。全精度の重みを 2 つ持たないよう、1 つのモデル ID につき 1 件だけ保持する
+_MODEL_CACHE: dict[tuple[str, torch.dtype, Quantization], Any] = {}
+# 起動時の事前読み込みと初回クリックが同じモデルを二重に読み込まないようにする
+_MODEL_LOCK = threading.Lock()
+# 参照音声パス -> ((mtime_ns, size), 変換済み波形)。Gradio で同じアップロードを再利用する際に ffmpeg を省く
+# アップロードごとにパスが変わるため、波形を溜め込まないよう直近の数件だけ保持する（挿入順 = 古い順）
+_REF_AUDIO_CACHE: dict[str, tuple[tuple[int, int], RefAudio]] = {}
+_REF_AUDIO_CACHE_SIZE = 2
+# 出力 wav の書き込み用。終了時に書きかけのファイルが残らないよう executor のスレッドで行う
+_WAV_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wav-writer")
 _logger = logging.getLogger("qwen_tts")
 
 
@@ -58,6 +114,24 @@ def setup_logging(log_file: Path | None = None) -> logging.Logger:
     return logger
 
 
+@functools.lru_cache(maxsize=1)
+def _preflight_cached() -> tuple[str, ...]:
+    errors: list[str] = []
+    if not _HAS_MPS:
+        errors.append("MPSが利用できません。Apple Silicon Macが必要です。")
+    # Gradio は逐次再生の各チャンクを pydub 経由で AAC に変換するので、参照音声の形式によらず必要
+    if _FFMPEG_PATH is None or shutil.which("ffprobe") is None:
+        errors.append(
+            "ffmpeg（ffprobe）が見つかりません。brew install ffmpeg でインストールしてください。"
+        )
+    return tuple(errors)
+
+
+def preflight_check() -> list[str]:
+    """実行環境のチェック。結果はプロセス中で変わらないので初回のみ実行する"""
+    return list(_preflight_cached())
+
+
 def validate_required_inputs(
     ref_audio_path: str | None,
     ref_text: str | None,
@@ -78,25 +152,196 @@ def validate_required_inputs(
     return errors
 
 
-def generate_voice_waveform(
-    ref_audio_path: str,
-    ref_text: str | None,
-    input_text: str,
-    language: str = "Japanese",
-    model_id: str = "Qwen/Qwen3-TTS-12Hz-0.6B-Base",
-    x_vector_only_mode: bool = False,
+def _load_model(
+    model_id: str, dtype: torch.dtype = torch.float32, quantize: Quantization = "none"
+) -> Any:
+    """モデルを読み込んでキャッシュする。事前読み込み中なら完了を待って同じインスタンスを返す"""
+    cache_key = (model_id, dtype, quantize)
+    with _MODEL_LOCK:
+        if cache_key not in _MODEL_CACHE:
+            _evict_model_variants(model_id)
+            _logger.info("モデル読み込み開始: %s (dtype=%s)", model_id, dtype)
+            _apply_mps_memory_fraction()
+            load_kwargs: dict[str, Any] = {
+                "device_map": _DEVICE,
+                "dtype": dtype,
+                "attn_implementation": "eager",
+            }
+            try:
+                # device_map 指定時、transformers は accelerate で meta デバイス上にモデルを構築し
+                # 重みをシャードごとに直接デバイスへ読み込む（CPU 上でのランダム初期化を経由しない）
+                try:
+                    model = Qwen3TTSModel.from_pretrained(
+                        model_id, low_cpu_mem_usage=True, use_safetensors=True, **load_kwargs
+                    )
+                except TypeError:
+                    # 古い qwen_tts は追加の読み込みオプションを受け付けない
+                    _logger.info("省メモリ読み込み非対応のため通常読み込みに切り替えます")
+                    model = Qwen3TTSModel.from_pretrained(model_id, **load_kwargs)
+                _logger.info("モデル読み込み完了: %s (dtype=%s)", model_id, dtype)
+            except Exception as exc:
+                _logger.error("モデル読み込み失敗: %s", exc)
+                raise VoiceCloneError(f"モデル読み込みに失敗しました: {exc}") from exc
+            if quantize != "none":
+                _quantize_weights(model, quantize)
+            _maybe_compile(model)
+            _MODEL_CACHE[cache_key] = model
+        return _MODEL_CACHE[cache_key]
+
+
+def _evict_model_variants(model_id: str) -> None:
+    """同じモデル ID の別 dtype・量子化版をキャッシュから外し、読み込み前にメモリを空ける"""
+    stale = [key for key in _MODEL_CACHE if key[0] == model_id]
+    if not stale:
+        return
+    for key in stale:
+        del _MODEL_CACHE[key]
+        _logger.info("キャッシュ済みモデルを解放: %s (dtype=%s, quantize=%s)", *key)
+    gc.collect()
+    if _HAS_MPS:
+        torch.mps.empty_cache()
+
+
+def _quantize_weights(model: Any, quantize: Quantization) -> None:
+    """optimum-quanto で線形層の重みを int8 / int4 に量子化する（MPS でもそのまま動く）"""
+    try:
+        from optimum.quanto import freeze, qint4, qint8
+        from optimum.quanto import quantize as quanto_quantize
+    except ImportError as exc:
+        raise VoiceCloneError(
+            "量子化には optimum-quanto が必要です: uv sync --extra quant"
+        ) from exc
+
+    module = getattr(model, "model", model)
+    if not isinstance(module, torch.nn.Module):
+        raise VoiceCloneError(f"量子化できないモデルです: {type(model).__name__}")
+    _logger.info("重み量子化開始: %s", quantize)
+    try:
+        quanto_quantize(module, weights=qint8 if quantize == "int8" else qint4)
+        freeze(module)
+    except Exception as exc:
+        _logger.error("重み量子化失敗: %s", exc)
+        raise VoiceCloneError(f"重みの量子化に失敗しました: {exc}") from exc
+    _logger.info("重み量子化完了: %s", quantize)
+
+
+def _apply_mps_memory_fraction() -> None:
+    """QWEN3_TTS_MPS_MEMORY_FRACTION が指定されていれば MPS のメモリ上限に設定する（未指定なら既定のまま）"""
+    value = os.environ.get("QWEN3_TTS_MPS_MEMORY_FRACTION")
+    if not value or _DEVICE != "mps":
+        return
+    try:
+        torch.mps.set_per_process_memory_fraction(float(value))
+        _logger.info("MPS メモリ上限: %s", value)
+    except (ValueError, RuntimeError) as exc:
+        _logger.warning("QWEN3_TTS_MPS_MEMORY_FRACTION を適用できません: %s (%s)", value, exc)
+
+
+def _maybe_compile(model: Any) -> None:
+    """QWEN3_TTS_COMPILE=1 のとき、デコードで毎トークン呼ばれる内部モデルの forward を torch.compile する"""
+    if os.environ.get("QWEN3_TTS_COMPILE") != "1":
+        return
+    root = getattr(model, "model", model)
+    backend = _COMPILE_BACKENDS.get(_DEVICE, "aot_eager")
+    compiled: list[str] = []
+    for path in _COMPILE_TARGETS:
+        module = functools.reduce(lambda obj, name: getattr(obj, name, None), path.split("."), root)
+        if not isinstance(module, torch.nn.Module):
+            _logger.warning("torch.compile 対象のモジュールが見つかりません: %s", path)
+            continue
+        try:
+            module.forward = _compiled_forward(module, path, backend)
+        except Exception as exc:
+            _logger.warning("torch.compile 失敗（通常実行を継続）: %s (%s)", path, exc)
+            continue
+        compiled.append(path)
+    if compiled:
+        _logger.info("torch.compile 有効化: backend=%s, 対象=%s", backend, ", ".join(compiled))
+
+
+def _compiled_forward(module: torch.nn.Module, name: str, backend: str) -> Callable[..., Any]:
+    """module.forward の torch.compile 版を返す。初回実行をログに残し、Dynamo が失敗したら元の forward に戻す"""
+    from torch._dynamo.exc import TorchDynamoException
+
+    eager = module.forward
+    compiled = torch.compile(eager, backend=backend, dynamic=True, fullgraph=False)
+    first_call = True
+
+    @functools.wraps(eager)
+    def forward(*args: Any, **kwargs: Any) -> Any:
+        nonlocal first_call
+        try:
+            output = compiled(*args, **kwargs)
+        except TorchDynamoException:
+            _logger.exception("torch.compile 版の実行に失敗、通常実行に戻します: %s", name)
+            module.forward = eager
+            return eager(*args, **kwargs)
+        if first_call:
+            first_call = False
+            _logger.info("torch.compile 版で実行: %s", name)
+        return output
+
+    return forward
+
+
+# ウォームアップ生成の上限トークン数（12Hz コーデックで約 2 秒）。無音参照でも EOS を待たずに打ち切る
+_WARMUP_MAX_NEW_TOKENS = 24
+
+
+def warmup_model(
+    model_id: str, dtype: torch.dtype = torch.float32, quantize: Quantization = "none"
+) -> None:
+    """短いダミー生成で MPS カーネルのコンパイルを初回生成前に済ませる。失敗しても送出しない"""
+    try:
+        model = _load_model(model_id, dtype, quantize)
+        # 実行中は _load_model がロック待ちになるので、初回クリックはウォームアップ完了を待つ
+        silence = np.zeros(REF_SAMPLE_RATE // 2, dtype=np.float32)
+        with _MODEL_LOCK, torch.inference_mode():
+            model.generate_voice_clone(
+                text="あ",
+                language="Japanese",
+                ref_audio=(silence, REF_SAMPLE_RATE),
+                ref_text="あ",
+                x_vector_only_mode=False,
+                max_new_tokens=_WARMUP_MAX_NEW_TOKENS,
+            )
+        _logger.info("ウォームアップ完了: %s (dtype=%s)", model_id, dtype)
+    except Exception as exc:
+        _logger.warning("ウォームアップ失敗: %s (%s)", model_id, exc)
+
+
+def preload_models(
+    model_ids: list[str],
     dtype: torch.dtype = torch.float32,
-) -> tuple[Any, int]:
-    _logger.info("音声生成開始: model=%s, language=%s", model_id, language)
+    warmup: bool = True,
+    quantize: Quantization = "none",
+) -> None:
+    """起動時にモデルを読み込んでおく（quantize 指定時は量子化済みで持つ）。失敗してもログに残すだけで例外は送出しない"""
+    if not _HAS_MPS:
+        _logger.warning("MPSが利用できないため事前読み込みをスキップします")
+        return
+    for model_id in model_ids:
+        try:
+            _load_model(model_id, dtype, quantize)
+        except Exception as exc:
+            # メモリ不足などで失敗しても起動は続ける
+            _logger.warning("モデル事前読み込み失敗（初回生成時に再試行）: %s (%s)", model_id, exc)
+            continue
+        if warmup:
+            warmup_model(model_id, dtype, quantize)
+
+
+def _notify(progress_callback: ProgressCallback | None, stage: str) -> None:
+    if progress_callback is not None:
+        progress_callback(stage)
+
 
-    # MPS availability check at runtime
-    if not torch.backends.mps.is_available():
+def _check_generation_inputs(
+    ref_text: str | None, input_text: str, x_vector_only_mode: bool
+) -> None:
+    if not _HAS_MPS:
         raise VoiceCloneError("MPSが利用できません。Apple Silicon Macが必要です。")
 
-    ref_audio = Path(ref_audio_path).expanduser().resolve()
-    if not ref_audio.exists():
-        _logger.error("参照音声ファイルが見つかりません: %s", ref_audio)
-        raise VoiceCloneError("参照音声ファイルが見つかりません。")
     if not input_text.strip():
         _logger.error("読み上げテキストが空です")
         raise VoiceCloneError("読み上げテキストが空です。")
@@ -104,52 +349,292 @@ def generate_voice_waveform(
         _logger.error("ref_text が未入力")
         raise VoiceCloneError("ref_text が必要です。参照音声の文字起こしを入力してください。")
 
-    cache_key = f"{model_id}_{dtype}"
-    if cache_key not in _MODEL_CACHE:
-        _logger.info("モデル読み込み開始: %s (dtype=%s)", model_id, dtype)
-        try:
-            _MODEL_CACHE[cache_key] = Qwen3TTSModel.from_pretrained(
-                model_id,
-                device_map="mps",
-                dtype=dtype,
-                attn_implementation="eager",
-            )
-            _logger.info("モデル読み込み完了: %s (dtype=%s)", model_id, dtype)
-        except Exception as exc:
-            _logger.error("モデル読み込み失敗: %s", exc)
-            raise VoiceCloneError(f"モデル読み込みに失敗しました: {exc}") from exc
-    model = _MODEL_CACHE[cache_key]
 
-    with tempfile.TemporaryDirectory() as td:
-        ref_wav = Path(td) / "ref.wav"
-        try:
-            AudioSegment.from_file(str(ref_audio)).set_channels(1).set_frame_rate(16000).export(
-                str(ref_wav), format="wav"
+def _run_ffmpeg_to_wav_inmem(in_path: Path) -> RefAudio:
+    """参照音声を 16kHz モノラルに変換し、ファイルに書き出さずに (float32 波形, sr) で返す"""
+    if _FFMPEG_PATH is None:
+        _logger.error("ffmpegが見つかりません: %s", in_path)
+        raise VoiceCloneError("この形式の変換には ffmpeg が必要です（brew install ffmpeg）。")
+    try:
+        # pydub 経由で ffmpeg を呼び出し、16bit PCM として受け取る
+        seg = (
+            AudioSegment.from_file(str(in_path))
+            .set_channels(1)
+            .set_frame_rate(REF_SAMPLE_RATE)
+            .set_sample_width(2)
+        )
+        pcm = np.frombuffer(seg.raw_data, dtype=np.int16)
+        _logger.info("音声変換完了: %s", in_path)
+    except Exception as exc:
+        _logger.error("音声変換失敗: %s", exc)
+        raise VoiceCloneError(f"音声変換に失敗しました: {exc}") from exc
+    return pcm.astype(np.float32) / 32768.0, REF_SAMPLE_RATE
+
+
+def _read_ref_audio_direct(in_path: Path) -> RefAudio | None:
+    """soundfile で読める形式（wav/flac/ogg 等）は ffmpeg を起動せずに変換する。読めなければ None"""
+    try:
+        data, sr = sf.read(str(in_path), dtype="float32", always_2d=False)
+    except RuntimeError:
+        return None
+    if data.ndim == 2:
+        data = data.mean(axis=1, dtype=np.float32)
+    if sr != REF_SAMPLE_RATE:
+        g = gcd(int(sr), REF_SAMPLE_RATE)
+        data = resample_poly(data, REF_SAMPLE_RATE // g, int(sr) // g).astype(np.float32)
+    _logger.info("音声変換完了（soundfile）: %s", in_path)
+    return np.ascontiguousarray(data), REF_SAMPLE_RATE
+
+
+def _prepare_ref_audio(ref_audio: Path) -> RefAudio:
+    """変換済み参照音声を返す。同じファイル（パス・更新時刻・サイズが一致）なら再変換しない"""
+    stat = ref_audio.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = str(ref_audio)
+    cached = _REF_AUDIO_CACHE.pop(key, None)
+    if cached and cached[0] == stamp:
+        _logger.info("変換済み参照音声を再利用: %s", ref_audio)
+        _REF_AUDIO_CACHE[key] = cached
+        return cached[1]
+
+    ref = _read_ref_audio_direct(ref_audio) or _run_ffmpeg_to_wav_inmem(ref_audio)
+    _REF_AUDIO_CACHE[key] = (stamp, ref)
+    while len(_REF_AUDIO_CACHE) > _REF_AUDIO_CACHE_SIZE:
+        del _REF_AUDIO_CACHE[next(iter(_REF_AUDIO_CACHE))]
+    return ref
+
+
+def _prepare_ref_audio_and_model(
+    ref_audio: Path,
+    model_id: str,
+    dtype: torch.dtype,
+    quantize: Quantization = "none",
+    progress_callback: ProgressCallback | None = None,
+) -> tuple[RefAudio, Any]:
+    """参照音声の変換を別スレッドで進めながらモデルを読み込む"""
+    # 変換は CPU（ffmpeg）のみで完結するので、MPS を使うモデル読み込みと並行できる
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        ref_future = pool.submit(_prepare_ref_audio, ref_audio)
+        _notify(progress_callback, "load_model")
+        model = _load_model(model_id, dtype, quantize)
+        return ref_future.result(), model
+
+
+def _to_float32_numpy(wav: Any) -> np.ndarray:
+    """生成結果を連続した float32 の numpy 配列にする（デバイス上のテンソルは 1 回の転送で済ませる）"""
+    if isinstance(wav, torch.Tensor):
+        return wav.detach().to("cpu", dtype=torch.float32).contiguous().numpy()
+    return np.ascontiguousarray(wav, dtype=np.float32)
+
+
+def _create_voice_clone_prompt(
+    model: Any, ref: RefAudio, ref_text: str | None, x_vector_only_mode: bool = False
+) -> VoiceClonePrompt:
+    """参照音声の符号化と話者埋め込みの抽出を 1 回だけ行い、生成のたびに使い回すプロンプトを作る"""
+    try:
+        with torch.inference_mode():
+            prompt = model.create_voice_clone_prompt(
+                ref_audio=ref,
+                ref_text=ref_text or None,
+                x_vector_only_mode=bool(x_vector_only_mode),
             )
-            _logger.info("音声変換完了: %s", ref_audio)
-        except Exception as exc:
-            _logger.error("音声変換失敗: %s", exc)
-            raise VoiceCloneError(f"音声変換に失敗しました: {exc}") from exc
+        _logger.info("参照音声プロンプト作成完了")
+    except (RuntimeError, ValueError) as exc:
+        _logger.error("参照音声プロンプト作成失敗: %s", exc)
+        raise VoiceCloneError(f"参照音声の処理に失敗しました: {exc}") from exc
+    return list(prompt)
 
-        try:
-            _logger.info("音声生成実行中...")
+
+def _generate_with_model(
+    model: Any,
+    prompt: VoiceClonePrompt,
+    input_text: str,
+    language: str = "Japanese",
+) -> tuple[np.ndarray, int]:
+    """読み込み済みモデルと作成済みの参照音声プロンプトで 1 テキスト分の音声を生成する"""
+    try:
+        _logger.info("音声生成実行中...")
+        with torch.inference_mode():
             wavs, sample_rate = model.generate_voice_clone(
                 text=input_text,
                 language=language,
-                ref_audio=str(ref_wav),
-                ref_text=ref_text or None,
-                x_vector_only_mode=bool(x_vector_only_mode),
+                voice_clone_prompt=prompt,
             )
-            _logger.info("音声生成完了: %d chunks, sr=%d", len(wavs), sample_rate)
-        except RuntimeError as exc:
-            _logger.error("音声生成失敗: %s", exc)
-            raise VoiceCloneError(f"音声生成に失敗しました: {exc}") from exc
+        _logger.info("音声生成完了: %d chunks, sr=%d", len(wavs), sample_rate)
+    except RuntimeError as exc:
+        _logger.error("音声生成失敗: %s", exc)
+        raise VoiceCloneError(f"音声生成に失敗しました: {exc}") from exc
 
     if not wavs:
         _logger.error("音声生成結果が空")
         raise VoiceCloneError("音声生成結果が空でした。入力テキストを見直してください。")
 
-    return np.asarray(wavs[0], dtype=np.float32), int(sample_rate)
+    return _to_float32_numpy(wavs[0]), int(sample_rate)
+
+
+def _resolve_ref_audio(ref_audio_path: str) -> Path:
+    ref_audio = Path(ref_audio_path).expanduser().resolve()
+    if not ref_audio.exists():
+        _logger.error("参照音声ファイルが見つかりません: %s", ref_audio)
+        raise VoiceCloneError("参照音声ファイルが見つかりません。")
+    return ref_audio
+
+
+def concat_with_silence(
+    wavs: list[np.ndarray], sample_rate: int, silence_sec: float = 0.0
+) -> np.ndarray:
+    """波形を silence_sec 秒の無音を挟んで連結する。出力バッファは 1 回だけ確保する"""
+    if not wavs:
+        return np.zeros((0,), dtype=np.float32)
+    sil_len = int(sample_rate * silence_sec)
+    if sil_len == 0:
+        # 逐次再生のチャンク結合など無音を挟まない場合は、C 側で 1 回コピーするだけで済む
+        return np.concatenate(wavs, dtype=np.float32)
+    total = sum(w.size for w in wavs) + (len(wavs) - 1) * sil_len
+    out = np.empty(total, dtype=np.float32)
+    offset = 0
+    for i, w in enumerate(wavs):
+        out[offset : offset + w.size] = w
+        offset += w.size
+        if i != len(wavs) - 1:
+            out[offset : offset + sil_len] = 0.0
+            offset += sil_len
+    return out
+
+
+def split_sentences(text: str) -> list[str]:
+    """読み上げテキストを文単位（句点・感嘆符・疑問符・改行）に分割する。短すぎる断片は次の文に含める"""
+    sentences: list[str] = []
+    pending = ""
+    for part in _SENTENCE_BOUNDARY.split(text):
+        pending += part
+        if len(pending.strip()) >= _MIN_SENTENCE_CHARS:
+            sentences.append(pending)
+            pending = ""
+    if pending.strip():
+        # 末尾に残った短い断片は直前の文につなげる
+        if sentences:
+            sentences[-1] += pending
+        else:
+            sentences.append(pending)
+    return [sentence.strip() for sentence in sentences]
+
+
+def iter_voice_waveform(
+    ref_audio_path: str,
+    ref_text: str | None,
+    input_text: str,
+    language: str = "Japanese",
+    model_id: str = "Qwen/Qwen3-TTS-12Hz-0.6B-Base",
+    x_vector_only_mode: bool = False,
+    dtype: torch.dtype = torch.float32,
+    quantize: Quantization = "none",
+    progress_callback: ProgressCallback | None = None,
+    min_chunk_sec: float = STREAM_MIN_CHUNK_SEC,
+    silence_sec: float = SENTENCE_SILENCE_SEC,
+) -> Iterator[tuple[np.ndarray, int]]:
+    """文ごとに音声を生成し、min_chunk_sec 以上たまるたびに (波形, sr) を返す。文の間には silence_sec の無音を入れる"""
+    _logger.info("音声生成開始（逐次）: model=%s, language=%s", model_id, language)
+
+    ref_audio = _resolve_ref_audio(ref_audio_path)
+    _check_generation_inputs(ref_text, input_text, x_vector_only_mode)
+    ref, model = _prepare_ref_audio_and_model(
+        ref_audio, model_id, dtype, quantize, progress_callback
+    )
+
+    sentences = split_sentences(input_text)
+    _logger.info("文数: %d", len(sentences))
+
+    _notify(progress_callback, "generate")
+    # 参照音声の符号化は全文で共通なので、文ごとに繰り返さない
+    prompt = _create_voice_clone_prompt(model, ref, ref_text, x_vector_only_mode)
+    pending: list[np.ndarray] = []
+    pending_len = 0
+    sample_rate = 0
+    for index, sentence in enumerate(sentences):
+        wav, sample_rate = _generate_with_model(
+            model, prompt, input_text=sentence, language=language
+        )
+        if index:
+            # 無音は次の文の頭に付ける。チャンクの境目でも文の間が同じ長さになる
+            silence = np.zeros(int(round(silence_sec * sample_rate)), dtype=np.float32)
+            pending.append(silence)
+            pending_len += len(silence)
+        pending.append(wav)
+        pending_len += len(wav)
+        # 細かすぎるチャンクはブラウザ側の再生が途切れるので、一定長までまとめて返す
+        if pending_len >= min_chunk_sec * sample_rate:
+            yield concat_with_silence(pending, sample_rate), sample_rate
+            pending, pending_len = [], 0
+    if pending:
+        yield concat_with_silence(pending, sample_rate), sample_rate
+
+
+def generate_voice_waveforms_batch(
+    ref_audio_path: str,
+    ref_text: str | None,
+    input_texts: list[str],
+    language: str = "Japanese",
+    model_id: str = "Qwen/Qwen3-TTS-12Hz-0.6B-Base",
+    x_vector_only_mode: bool = False,
+    dtype: torch.dtype = torch.float32,
+    quantize: Quantization = "none",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress_callback: ProgressCallback | None = None,
+) -> tuple[list[np.ndarray], int]:
+    """複数テキストを batch_size 件ずつまとめて生成する。参照音声の変換と符号化は 1 回だけ行う"""
+    _logger.info(
+        "一括生成開始: model=%s, language=%s, %d件 (batch_size=%d)",
+        model_id,
+        language,
+        len(input_texts),
+        batch_size,
+    )
+    if batch_size < 1:
+        raise VoiceCloneError("batch_size は 1 以上を指定してください。")
+
+    ref_audio = _resolve_ref_audio(ref_audio_path)
+    for text in input_texts:
+        _check_generation_inputs(ref_text, text, x_vector_only_mode)
+    ref, model = _prepare_ref_audio_and_model(
+        ref_audio, model_id, dtype, quantize, progress_callback
+    )
+
+    _notify(progress_callback, "generate")
+    # 参照音声の符号化はミニバッチごとに繰り返さず、作ったプロンプトを全件で共有する
+    prompt = _create_voice_clone_prompt(model, ref, ref_text, x_vector_only_mode)
+    results: list[np.ndarray] = []
+    sample_rate = 0
+    for start in range(0, len(input_texts), batch_size):
+        batch = input_texts[start : start + batch_size]
+        _logger.info("行 %d-%d/%d 生成中...", start + 1, start + len(batch), len(input_texts))
+        try:
+            # プロンプトは 1 件だけ渡せばモデル側でバッチ全体に使われる
+            with torch.inference_mode():
+                wavs, sample_rate = model.generate_voice_clone(
+                    text=batch,
+                    language=[language] * len(batch),
+                    voice_clone_prompt=prompt,
+                )
+        except RuntimeError as exc:
+            _logger.error("音声生成失敗: %s", exc)
+            raise VoiceCloneError(f"音声生成に失敗しました: {exc}") from exc
+        if len(wavs) != len(batch):
+            _logger.error("生成結果の件数不一致: %d != %d", len(wavs), len(batch))
+            raise VoiceCloneError("音声生成結果の件数が入力と一致しませんでした。")
+        results.extend(_to_float32_numpy(w) for w in wavs)
+
+    _logger.info("一括生成完了: %d件, sr=%d", len(results), sample_rate)
+    return results, int(sample_rate)
+
+
+def _save_wav(out_path: Path, wav: np.ndarray, sample_rate: int) -> None:
+    try:
+        sf.write(str(out_path), wav, sample_rate)
+        _logger.info("ファイル保存完了: %s", out_path)
+    except Exception as exc:
+        _logger.error("ファイル保存失敗: %s", exc)
+        raise
 
 
 def synthesize_voice_clone(
@@ -160,6 +645,10 @@ def synthesize_voice_clone(
     language: str = "Japanese",
     model_id: str = "Qwen/Qwen3-TTS-12Hz-0.6B-Base",
     dtype: torch.dtype = torch.float32,
+    quantize: Quantization = "none",
+    progress_callback: ProgressCallback | None = None,
+    chunk_callback: ChunkCallback | None = None,
+    background_save: bool = False,
 ) -> dict[str, Any]:
     _logger.info("入力検証開始")
 
@@ -195,8 +684,10 @@ def synthesize_voice_clone(
     out_path = out_dir / f"voiceclone_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
     _logger.info("出力ファイル: %s", out_path)
 
+    chunks: list[np.ndarray] = []
+    sample_rate = 0
     try:
-        wav, sample_rate = generate_voice_waveform(
+        for chunk, sample_rate in iter_voice_waveform(
             ref_audio_path=ref_audio_path,
             ref_text=ref_text,
             input_text=input_text,
@@ -204,18 +695,34 @@ def synthesize_voice_clone(
             model_id=model_id,
             x_vector_only_mode=False,
             dtype=dtype,
-        )
+            quantize=quantize,
+            progress_callback=progress_callback,
+        ):
+            chunks.append(chunk)
+            if chunk_callback is not None:
+                chunk_callback(chunk, sample_rate)
+        wav = concat_with_silence(chunks, sample_rate)
     except VoiceCloneError as exc:
         return {"ok": False, "message": str(exc)}
     except Exception as exc:
         _logger.exception("予期しないエラー")
         return {"ok": False, "message": f"予期しないエラー: {exc}"}
 
+    _notify(progress_callback, "save")
+    if background_save:
+        # 書き込み中も呼び出し側がメモリ上の音声を先に使えるよう、完了待ちは save_future に任せる
+        save_future = _WAV_WRITER.submit(_save_wav, out_path, wav, sample_rate)
+        return {
+            "ok": True,
+            "output_path": str(out_path),
+            "sample_rate": sample_rate,
+            "save_future": save_future,
+            "message": f"生成しました（保存中）: {out_path} (sr={sample_rate})",
+        }
+
     try:
-        sf.write(str(out_path), wav, sample_rate)
-        _logger.info("ファイル保存完了: %s", out_path)
+        _save_wav(out_path, wav, sample_rate)
     except Exception as exc:
-        _logger.error("ファイル保存失敗: %s", exc)
         return {"ok": False, "message": f"音声ファイル保存失敗: {exc}"}
 
     return {
@@ -0,0 +1,197 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from qwen3_tts_test import voice_clone_core
+from qwen3_tts_test.voice_clone_core import REF_SAMPLE_RATE, concat_with_silence, split_sentences
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        (
+            "今日はとても良い天気ですね。明日は雨が降るそうです。",
+            ["今日はとても良い天気ですね。", "明日は雨が降るそうです。"],
+        ),
+        ("Hello there. How are you today?", ["Hello there.", "How are you today?"]),
+        (
+            "1行目のテキストです\n2行目のテキストです\n\n",
+            ["1行目のテキストです", "2行目のテキストです"],
+        ),
+    ],
+)
+def test_split_sentences_splits_at_sentence_end(text: str, expected: list[str]) -> None:
+    assert split_sentences(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "「はい！」と言った。",
+        "本当？！それは知らなかった。",
+        "Mr. Smith went 3.5 km.",
+    ],
+)
+def test_split_sentences_keeps_single_sentence(text: str) -> None:
+    assert split_sentences(text) == [text]
+
+
+def test_split_sentences_splits_between_quotes() -> None:
+    assert split_sentences("「本当ですか？」「ええ、本当です。」では行きましょう。") == [
+        "「本当ですか？」",
+        "「ええ、本当です。」では行きましょう。",
+    ]
+
+
+def test_split_sentences_attaches_short_tail_to_previous() -> None:
+    assert split_sentences("これは長い最初の文です。OK.") == ["これは長い最初の文です。OK."]
+
+
+@pytest.mark.parametrize("text", ["", " \n "])
+def test_split_sentences_empty(text: str) -> None:
+    assert split_sentences(text) == []
+
+
+@pytest.mark.parametrize("silence_sec", [0.0, 0.25])
+def test_concat_with_silence_matches_np_concatenate(silence_sec: float) -> None:
+    rng = np.random.default_rng(0)
+    sample_rate = 1000
+    wavs = [rng.standard_normal(n).astype(np.float32) for n in (300, 1, 1200)]
+    gap = np.zeros(int(sample_rate * silence_sec), dtype=np.float32)
+    expected = np.concatenate([wavs[0], gap, wavs[1], gap, wavs[2]])
+
+    out = concat_with_silence(wavs, sample_rate, silence_sec)
+
+    assert out.dtype == np.float32
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_concat_with_silence_casts_to_float32() -> None:
+    out = concat_with_silence([np.ones(3, dtype=np.float64)], 1000)
+    assert out.dtype == np.float32
+    np.testing.assert_array_equal(out, np.ones(3, dtype=np.float32))
+
+
+def test_concat_with_silence_empty() -> None:
+    out = concat_with_silence([], 1000, 0.25)
+    assert out.dtype == np.float32
+    assert out.size == 0
+
+
+@pytest.fixture
+def ref_reads(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """参照音声キャッシュを空にし、実際にファイルを読んだパスを記録する"""
+    monkeypatch.setattr(voice_clone_core, "_REF_AUDIO_CACHE", {})
+    reads: list[Path] = []
+    read_direct = voice_clone_core._read_ref_audio_direct
+
+    def recording_read(in_path: Path) -> voice_clone_core.RefAudio | None:
+        reads.append(in_path)
+        return read_direct(in_path)
+
+    monkeypatch.setattr(voice_clone_core, "_read_ref_audio_direct", recording_read)
+    return reads
+
+
+def _write_ref(path: Path, seconds: float = 0.1) -> Path:
+    sf.write(path, np.zeros(int(REF_SAMPLE_RATE * seconds), dtype=np.float32), REF_SAMPLE_RATE)
+    return path
+
+
+def test_prepare_ref_audio_reuses_same_file(tmp_path: Path, ref_reads: list[Path]) -> None:
+    ref = _write_ref(tmp_path / "ref.wav")
+
+    first = voice_clone_core._prepare_ref_audio(ref)
+    second = voice_clone_core._prepare_ref_audio(ref)
+
+    assert second is first
+    assert ref_reads == [ref]
+
+
+def test_prepare_ref_audio_rereads_changed_file(tmp_path: Path, ref_reads: list[Path]) -> None:
+    ref = _write_ref(tmp_path / "ref.wav", seconds=0.1)
+    voice_clone_core._prepare_ref_audio(ref)
+    _write_ref(ref, seconds=0.2)
+
+    wav, _ = voice_clone_core._prepare_ref_audio(ref)
+
+    assert wav.size == int(REF_SAMPLE_RATE * 0.2)
+    assert ref_reads == [ref, ref]
+
+
+def test_prepare_ref_audio_evicts_least_recently_used(
+    tmp_path: Path, ref_reads: list[Path]
+) -> None:
+    a, b, c = (_write_ref(tmp_path / f"{name}.wav") for name in "abc")
+    voice_clone_core._prepare_ref_audio(a)
+    voice_clone_core._prepare_ref_audio(b)
+    voice_clone_core._prepare_ref_audio(a)  # a を最近使ったものにする
+    voice_clone_core._prepare_ref_audio(c)  # 上限 2 件なので b が追い出される
+
+    assert list(voice_clone_core._REF_AUDIO_CACHE) == [str(a), str(c)]
+    voice_clone_core._prepare_ref_audio(b)
+    assert ref_reads == [a, b, c, b]
+
+
+@pytest.mark.parametrize(
+    ("sample_rate", "channels"),
+    [(REF_SAMPLE_RATE, 1), (REF_SAMPLE_RATE, 2), (48000, 1), (44100, 2)],
+)
+def test_read_ref_audio_direct_converts_to_16k_mono(
+    tmp_path: Path, sample_rate: int, channels: int
+) -> None:
+    frames = sample_rate // 2
+    data = np.full((frames, channels), 0.5, dtype=np.float32)
+    if channels == 2:
+        data[:, 1] = 0.25
+    sf.write(tmp_path / "ref.wav", data, sample_rate, subtype="FLOAT")
+
+    ref = voice_clone_core._read_ref_audio_direct(tmp_path / "ref.wav")
+
+    assert ref is not None
+    wav, sr = ref
+    assert sr == REF_SAMPLE_RATE
+    assert wav.dtype == np.float32
+    assert wav.ndim == 1
+    assert wav.flags.c_contiguous
+    assert wav.size == REF_SAMPLE_RATE // 2
+    # 端はリサンプルのフィルタで変わるので中央だけ見る
+    expected = 0.5 if channels == 1 else 0.375
+    np.testing.assert_allclose(wav[wav.size // 4 : -wav.size // 4], expected, atol=1e-3)
+
+
+def test_read_ref_audio_direct_returns_none_for_unreadable(tmp_path: Path) -> None:
+    path = tmp_path / "ref.m4a"
+    path.write_bytes(b"not an audio file")
+    with pytest.raises(sf.LibsndfileError):
+        sf.read(str(path))
+
+    assert voice_clone_core._read_ref_audio_direct(path) is None
+
+
+def test_prepare_ref_audio_falls_back_to_ffmpeg(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, ref_reads: list[Path]
+) -> None:
+    path = tmp_path / "ref.m4a"
+    path.write_bytes(b"not an audio file")
+    decoded = (np.zeros(4, dtype=np.float32), REF_SAMPLE_RATE)
+    monkeypatch.setattr(voice_clone_core, "_run_ffmpeg_to_wav_inmem", lambda in_path: decoded)
+
+    assert voice_clone_core._prepare_ref_audio(path) is decoded
+    assert ref_reads == [path]
+
+
+@pytest.mark.parametrize("has_mps", [True, False])
+def test_preflight_check_requires_ffmpeg(monkeypatch: pytest.MonkeyPatch, has_mps: bool) -> None:
+    monkeypatch.setattr(voice_clone_core, "_HAS_MPS", has_mps)
+    monkeypatch.setattr(voice_clone_core, "_FFMPEG_PATH", None)
+    voice_clone_core._preflight_cached.cache_clear()
+    try:
+        errors = voice_clone_core.preflight_check()
+    finally:
+        voice_clone_core._preflight_cached.cache_clear()
+
+    assert any("ffmpeg" in error for error in errors)
+    assert any("MPS" in error for error in errors) is not has_mps